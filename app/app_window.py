@@ -1,4 +1,5 @@
 # app_window.py
+import os
 from PySide6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QFrame
 from PySide6.QtCore import Qt
 from ui.schematic_view import SchematicView
@@ -23,7 +24,9 @@ class AppWindow(QMainWindow):
         main_layout = QHBoxLayout(central)
 
         # --- Schematic View (The Canvas) ---
-        self.schematic_view = SchematicView()
+        # EDA_OPENGL=1 renders through the GPU; off by default for headless/remote sessions
+        use_opengl = os.environ.get("EDA_OPENGL") == "1"
+        self.schematic_view = SchematicView(use_opengl=use_opengl)
         main_layout.addWidget(self.schematic_view, stretch=1)
 
         # --- Right Side Panel (Tools & Properties) ---
@@ -93,8 +93,9 @@ class ComponentPalette(QWidget):
         self.schematic_view.setCursor(cursor)
 
         # Reset wire tool state if switching away
-        if mode != "wire":
-            self.schematic_view.drawing_wire = False
+        if mode != "wire" and self.schematic_view.drawing_wire:
+            # Also drops the preview wire and restores the idle update mode
+            self.schematic_view.cancel_wire_drawing()
 
     def add_component(self, comp_type: str) -> None:
         """Instantiates a new component at the center of the current view."""
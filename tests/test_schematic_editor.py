@@ -3,19 +3,22 @@ import unittest
 import json
 import os
 import tempfile
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, patch, call
 
-from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import QPointF
-from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QApplication, QGraphicsItem, QGraphicsScene, QGraphicsView
+from PySide6.QtCore import QEvent, QPoint, QPointF, QRectF, Qt
+from PySide6.QtGui import QColor, QMouseEvent, QPainter, QTransform
+from PySide6.QtOpenGLWidgets import QOpenGLWidget
 
 from core.component import Component
 from core.pin import Pin, PinDirection
 from core.net import Net
 from ui.component_item import ComponentItem
+from ui.grid import draw_grid
 from ui.wire_segment_item import WireSegmentItem
 from ui.junction_item import JunctionItem
 from ui.schematic_view import SchematicView
+from ui.spatial_hash import SpatialHash, SegmentHash
 from ui.undo_commands import (
     UndoStack,
     MoveComponentCommand,
@@ -129,6 +132,46 @@ class TestWireSegmentItem(unittest.TestCase):
         wire.set_color_from_hex("#00ff00")
         self.assertEqual(wire.color.green(), 255)
 
+    def test_wire_color_hex_follows_set_color(self):
+        """Test that the cached hex string is refreshed on color changes."""
+        wire = WireSegmentItem(0, 0, 100, 0)
+        wire.set_color(QColor(0, 0, 255))
+        self.assertEqual(wire.color_hex, "#0000ff")
+        wire.set_color_from_hex("#00FF00")
+        self.assertEqual(wire.color_hex, "#00ff00")
+
+    def test_preview_wire_is_inert_overlay(self):
+        """Test that a preview wire draws on top and takes no clicks or selection."""
+        preview = WireSegmentItem(0, 0, 100, 0, preview=True)
+        self.assertEqual(preview.zValue(), WireSegmentItem.PREVIEW_Z)
+        self.assertFalse(preview.flags() & QGraphicsItem.ItemIsSelectable)
+        self.assertEqual(preview.acceptedMouseButtons(), Qt.NoButton)
+
+    def test_wires_share_pen_per_color(self):
+        """Test that wires of one color reuse the same cached pens."""
+        w1 = WireSegmentItem(0, 0, 100, 0, color=QColor(0, 0, 255))
+        w2 = WireSegmentItem(0, 10, 100, 10, color=QColor(0, 0, 255))
+        preview = WireSegmentItem(0, 20, 100, 20, preview=True, color=QColor(0, 0, 255))
+        self.assertIs(w1.base_pen, w2.base_pen)
+        self.assertIsNot(preview.base_pen, w1.base_pen)
+        self.assertEqual(preview.base_pen.style(), Qt.DashLine)
+        self.assertIs(WireSegmentItem._pen_for("glow", w1.color),
+                      WireSegmentItem._pen_for("glow", w2.color))
+
+    def test_wire_paints_axis_aligned_without_antialiasing(self):
+        """Test that straight wires drop antialiasing and restore it afterwards."""
+        painter = MagicMock()
+        painter.testRenderHint.return_value = True
+
+        WireSegmentItem(0, 0, 100, 0).paint(painter, None)
+        self.assertEqual(painter.setRenderHint.call_args_list,
+                         [call(QPainter.Antialiasing, False), call(QPainter.Antialiasing, True)])
+
+        painter.reset_mock()
+        WireSegmentItem(0, 0, 100, 50).paint(painter, None)
+        painter.setRenderHint.assert_not_called()
+        painter.drawLine.assert_called_once()
+
     def test_wire_glow(self):
         """Test wire highlight/glow functionality."""
         wire = WireSegmentItem(0, 0, 100, 0)
@@ -168,6 +211,21 @@ class TestJunctionItem(unittest.TestCase):
         self.assertEqual(snapped.x(), 20)
         self.assertEqual(snapped.y(), 50)
 
+    def test_junction_snap_to_grid_negative(self):
+        """Test junction snapping for negative coordinates and ties."""
+        junction = JunctionItem(0, 0)
+        snapped = junction._snap_to_grid(QPointF(-5.5, -14))
+        self.assertEqual(snapped.x(), -10)
+        self.assertEqual(snapped.y(), -10)
+        snapped = junction._snap_to_grid(QPointF(25, -25))
+        self.assertEqual(snapped.x(), 30)
+        self.assertEqual(snapped.y(), -20)
+
+    def test_junction_uses_device_cache(self):
+        """Test that junction dots are cached as device pixmaps."""
+        junction = JunctionItem(0, 0)
+        self.assertEqual(junction.cacheMode(), QGraphicsItem.DeviceCoordinateCache)
+
     def test_junction_scene_connection_point(self):
         """Test that scene_connection_point returns scene position."""
         junction = JunctionItem(150, 250)
@@ -175,6 +233,115 @@ class TestJunctionItem(unittest.TestCase):
         self.assertEqual(point.x(), 150)
         self.assertEqual(point.y(), 250)
 
+    def test_junction_view_cache_invalidated_on_scene_change(self):
+        """Test that the cached view is dropped when the junction leaves its scene."""
+        view = SchematicView()
+        junction = JunctionItem(0, 0)
+        self.assertIsNone(junction._view())
+
+        view.scene().addItem(junction)
+        self.assertIs(junction._view(), view)
+
+        view.scene().removeItem(junction)
+        self.assertIsNone(junction._view())
+
+    def test_selection_component_flag_follows_selection(self):
+        """Test that the view caches whether a component is selected."""
+        view = SchematicView()
+        junction = JunctionItem(0, 0)
+        comp = ComponentItem(Component("R1", comp_type="resistor"))
+        view.scene().addItem(junction)
+        view.scene().addItem(comp)
+
+        comp.setSelected(True)
+        self.assertTrue(junction._is_component_in_selection())
+        comp.setSelected(False)
+        self.assertFalse(junction._is_component_in_selection())
+
+    def test_selection_master_is_first_selected_component(self):
+        """Test that one cached master component leads a multi-selection drag."""
+        view = SchematicView()
+        comps = [ComponentItem(Component(f"R{i}", comp_type="resistor")) for i in (1, 2)]
+        for comp in comps:
+            view.scene().addItem(comp)
+            comp.setSelected(True)
+
+        masters = [comp for comp in comps if comp._is_master_component()]
+        self.assertEqual(masters, [view._selection_master])
+        self.assertEqual(view.get_snapping_grid_size(), 50)
+
+        view.scene().clearSelection()
+        self.assertFalse(any(comp._is_master_component() for comp in comps))
+        self.assertEqual(view.get_snapping_grid_size(), 10)
+
+    def test_component_drag_moves_cached_selected_junctions(self):
+        """Test that a dragged component moves selected junctions without rescanning."""
+        view = SchematicView()
+        comp = ComponentItem(Component("R1", comp_type="resistor"))
+        junction = JunctionItem(100, 100)
+        view.scene().addItem(comp)
+        view.scene().addItem(junction)
+        comp.setSelected(True)
+        junction.setSelected(True)
+        self.assertEqual(view._selected_junctions, [junction])
+
+        with patch.object(view.scene(), "selectedItems", side_effect=AssertionError):
+            comp.setPos(50, 0)
+        self.assertEqual(junction.pos(), QPointF(150, 100))
+
+    def test_junction_move_within_cell_skips_stretch(self):
+        """Test that sub-cell drags do not stretch wires."""
+        view = SchematicView()
+        junction = JunctionItem(100, 100)
+        view.scene().addItem(junction)
+
+        with patch.object(view, "_stretch_wires_at") as mock_stretch:
+            junction.setPos(103, 98)
+            mock_stretch.assert_not_called()
+            self.assertEqual(junction.pos(), QPointF(100, 100))
+
+            junction.setPos(108, 100)
+            mock_stretch.assert_called_once_with(QPointF(100, 100), QPointF(110, 100))
+
+
+class TestSpatialHash(unittest.TestCase):
+    """Tests for the SpatialHash proximity index."""
+
+    def test_nearest_across_cells(self):
+        """Test that the nearest item is found even in a neighbouring cell."""
+        index = SpatialHash(cell_size=50)
+        index.insert("a", 48, 0)
+        index.insert("b", 60, 0)
+        self.assertEqual(index.nearest(52, 0, 10), ("a", 48, 0))
+        self.assertIsNone(index.nearest(200, 200, 10))
+
+    def test_insert_moves_and_remove(self):
+        """Test that re-inserting moves an item and remove drops it."""
+        index = SpatialHash(cell_size=50)
+        index.insert("a", 0, 0)
+        index.insert("a", 500, 500)
+        self.assertIsNone(index.nearest(0, 0, 10))
+        self.assertEqual(index.nearest(505, 495, 10), ("a", 500, 500))
+        index.remove("a")
+        self.assertEqual(len(index), 0)
+        self.assertIsNone(index.nearest(500, 500, 10))
+
+
+class TestSegmentHash(unittest.TestCase):
+    """Tests for the SegmentHash wire bucket index."""
+
+    def test_long_segment_found_in_every_cell(self):
+        """Test that a segment spanning several cells is found along its length."""
+        index = SegmentHash(cell_size=50)
+        index.insert("w", 0, 10, 300, 10)
+        self.assertEqual(index.candidates(275, 10, 5), ["w"])
+        self.assertEqual(index.candidates(150, 200, 5), [])
+
+        index.insert("w", 0, 200, 0, 300)
+        self.assertEqual(index.candidates(275, 10, 5), [])
+        index.remove("w")
+        self.assertEqual(len(index), 0)
+
 
 class TestUndoStack(unittest.TestCase):
     """Tests for the UndoStack and Command pattern."""
@@ -228,6 +395,21 @@ class TestUndoStack(unittest.TestCase):
         self.assertEqual(len(stack.stack), 2)
         self.assertIs(stack.stack[1], cmd3)
 
+    def test_undo_stack_drops_oldest_past_limit(self):
+        """Test that the stack keeps only the newest max_undo commands."""
+        stack = UndoStack(max_undo=2)
+        cmds = [MagicMock() for _ in range(3)]
+        for cmd in cmds:
+            stack.push(cmd)
+
+        self.assertEqual(stack.stack, cmds[1:])
+        self.assertEqual(stack.index, 1)
+        stack.undo()
+        stack.undo()
+        stack.undo()  # Nothing left to undo
+        cmds[0].undo.assert_not_called()
+        self.assertEqual(stack.index, -1)
+
 
 class TestMoveComponentCommand(unittest.TestCase):
     """Tests for MoveComponentCommand."""
@@ -378,6 +560,52 @@ class TestSchematicView(unittest.TestCase):
         self.assertEqual(self.view.mode, "component")
         self.assertEqual(self.view.next_net_id, 1)
 
+    def test_scene_uses_no_index(self):
+        """Test that the dynamic wire scene skips BSP index maintenance."""
+        self.assertEqual(self.view.scene().itemIndexMethod(), QGraphicsScene.NoIndex)
+
+    def test_grid_drawn_in_background(self):
+        """Test that the grid is painted by the view rather than a scene item."""
+        self.assertEqual(self.view.scene().items(), [])
+        self.view.resize(200, 200)
+        image = self.view.grab().toImage()
+        colors = {image.pixelColor(x, x).name() for x in range(20, 180)}
+        self.assertIn("#646464", colors)  # Grid line colour
+        self.assertIn("#141414", colors)  # Background colour
+
+    def test_grid_background_is_cached(self):
+        """Test that repaints reuse the cached grid until the zoom changes."""
+        self.view.resize(200, 200)
+        self.view.grab()
+        with patch("ui.schematic_view.draw_grid") as draw:
+            self.view.grab()
+            self.assertEqual(draw.call_count, 0)
+            self.view.scale(2, 2)
+            self.view.grab()
+            self.assertEqual(draw.call_count, 1)
+
+    def test_draw_grid_batches_lines(self):
+        """Test that the grid is submitted as one drawLines call."""
+        painter = MagicMock()
+        painter.worldTransform.return_value = QTransform()
+        draw_grid(painter, QRectF(0, 0, 100, 100), 10)
+        painter.drawLine.assert_not_called()
+        painter.drawLines.assert_called_once()
+        self.assertEqual(len(painter.drawLines.call_args[0][0]), 6)  # x, y in 0, 50, 100
+
+    def test_draw_grid_thins_out_when_zoomed_out(self):
+        """Test that the grid coarsens, then disappears, at low zoom."""
+        painter = MagicMock()
+
+        painter.worldTransform.return_value = QTransform.fromScale(0.1, 0.1)  # 5px lines
+        draw_grid(painter, QRectF(0, 0, 500, 500), 10)
+        self.assertEqual(len(painter.drawLines.call_args[0][0]), 6)  # x, y in 0, 250, 500
+
+        painter.reset_mock()
+        painter.worldTransform.return_value = QTransform.fromScale(0.01, 0.01)
+        draw_grid(painter, QRectF(0, 0, 500, 500), 10)
+        painter.drawLines.assert_not_called()
+
     def test_schematic_view_grid_size(self):
         """Test that grid size is 10px."""
         self.assertEqual(self.view.GRID_SIZE, 10)
@@ -389,6 +617,35 @@ class TestSchematicView(unittest.TestCase):
         self.assertEqual(snapped.x(), 20)
         self.assertEqual(snapped.y(), 50)
 
+    def test_snap_point_prefers_nearby_pin(self):
+        """Test that points near a component pin snap onto the pin."""
+        item = ComponentItem(Component("R1", comp_type="resistor"))
+        item.setPos(100, 100)
+        self.view.scene().addItem(item)
+
+        snapped = self.view._snap_point(QPointF(103, 128))
+        self.assertEqual((snapped.x(), snapped.y()), (100, 125))
+
+    def test_snap_index_follows_component_and_junctions(self):
+        """Test that pins and junctions keep the snap index up to date."""
+        item = ComponentItem(Component("R1", comp_type="resistor"))
+        self.view.scene().addItem(item)
+        item.setPos(200, 200)
+
+        snapped = self.view._snap_point(QPointF(198, 227))
+        self.assertEqual((snapped.x(), snapped.y()), (200, 225))
+
+        self.view.scene().removeItem(item)
+        snapped = self.view._snap_point(QPointF(198, 227))
+        self.assertEqual((snapped.x(), snapped.y()), (200, 230))
+
+        # Off-grid endpoint, so only the junction can produce this snap
+        wire = WireSegmentItem(300, 305, 405, 305)
+        self.view.scene().addItem(wire)
+        self.view.register_wire_connection(wire)
+        snapped = self.view._snap_point(QPointF(401, 302))
+        self.assertEqual((snapped.x(), snapped.y()), (405, 305))
+
     def test_initial_wire_color(self):
         """Test that initial wire color is red."""
         color = self.view.get_current_wire_color()
@@ -413,6 +670,29 @@ class TestSchematicView(unittest.TestCase):
         self.assertIn((0, 0), self.view.point_to_net)
         self.assertIn((100, 0), self.view.point_to_net)
 
+    def test_point_key_absorbs_float_drift(self):
+        """Test that endpoint keys are integer tuples robust to float drift."""
+        self.assertEqual(self.view.point_key(29.9999999, 25.0000001), (30, 25))
+
+        wire1 = WireSegmentItem(0, 0, 30, 25)
+        wire2 = WireSegmentItem(29.9999999, 25.0000001, 60, 25)
+        self.view.register_wire_connection(wire1)
+        self.view.register_wire_connection(wire2)
+        self.assertEqual(wire1.net_id, wire2.net_id)
+
+    def test_split_wire_ignores_drifted_endpoint(self):
+        """Test that a click on a wire end (within rounding) does not split it."""
+        wire = WireSegmentItem(0, 0, 100, 0)
+        self.view.scene().addItem(wire)
+        self.view.register_wire_connection(wire)
+
+        self.view._check_and_split_wire(QPointF(99.9999999, 0))
+        self.assertIs(wire.scene(), self.view.scene())
+
+        self.view._check_and_split_wire(QPointF(50, 0))
+        self.assertIsNone(wire.scene())
+        self.assertEqual(len(self.view.endpoint_to_wires[(50, 0)]), 2)
+
     def test_net_merging(self):
         """Test that connecting two nets merges them."""
         # Create two separate wires (two nets)
@@ -436,6 +716,161 @@ class TestSchematicView(unittest.TestCase):
         # All should now be on same net
         self.assertEqual(wire1.net_id, wire3.net_id)
 
+    def test_net_to_wires_ignores_duplicate_registration(self):
+        """Test that re-registering a wire (e.g. on redo) does not duplicate it."""
+        wire1 = WireSegmentItem(0, 0, 100, 0)
+        wire2 = WireSegmentItem(100, 0, 200, 0)
+        self.view.register_wire_connection(wire1)
+        self.view.register_wire_connection(wire2)
+        self.view.register_wire_connection(wire1)
+
+        self.assertEqual(list(self.view.net_to_wires[wire1.net_id]), [wire1, wire2])
+
+    def test_merge_nets_moves_points_once(self):
+        """Test that merging nets moves every endpoint of the absorbed net."""
+        wire1 = WireSegmentItem(0, 0, 100, 0)
+        wire2 = WireSegmentItem(200, 0, 300, 0)
+        self.view.register_wire_connection(wire1)
+        self.view.register_wire_connection(wire2)
+        net1, net2 = wire1.net_id, wire2.net_id
+        self.assertNotEqual(net1, net2)
+
+        bridge = WireSegmentItem(100, 0, 200, 0)
+        self.view.register_wire_connection(bridge)
+
+        self.assertNotIn(net2, self.view.net_to_points)
+        self.assertEqual(self.view.net_to_points[net1], {(0, 0), (100, 0), (200, 0), (300, 0)})
+        for pt in self.view.net_to_points[net1]:
+            self.assertEqual(self.view.point_to_net[pt], net1)
+        self.assertEqual(wire2.net_id, net1)
+
+    def test_merge_keeps_larger_net(self):
+        """Test that merges relabel the smaller net into the larger one."""
+        big = [WireSegmentItem(x, 0, x + 100, 0) for x in (0, 100, 200)]
+        for wire in big:
+            self.view.register_wire_connection(wire)
+        small = WireSegmentItem(500, 0, 600, 0)
+        self.view.register_wire_connection(small)
+        big_net, small_net = big[0].net_id, small.net_id
+
+        # First endpoint lies on the small net, but the big net survives
+        bridge = WireSegmentItem(500, 0, 300, 0)
+        self.view.register_wire_connection(bridge)
+
+        self.assertEqual(small.net_id, big_net)
+        self.assertEqual(bridge.net_id, big_net)
+        self.assertNotIn(small_net, self.view.net_to_wires)
+        self.assertNotIn(small_net, self.view.net_to_points)
+
+    def test_stretch_uses_endpoint_index(self):
+        """Test that stretching moves indexed wires without scanning the scene."""
+        wire = WireSegmentItem(0, 0, 100, 0)
+        self.view.scene().addItem(wire)
+        self.view.register_wire_connection(wire)
+
+        with patch.object(self.view._scene, "items", side_effect=AssertionError):
+            self.view._stretch_wires_at(QPointF(100, 0), QPointF(100, 50))
+
+        self.assertEqual((wire.line().x2(), wire.line().y2()), (100, 50))
+        self.assertEqual(self.view.endpoint_to_wires[(100, 50)], [wire])
+        self.assertNotIn((100, 0), self.view.endpoint_to_wires)
+        self.assertEqual(self.view.point_to_net[(100, 50)], wire.net_id)
+        self.assertNotIn((100, 0), self.view.point_to_net)
+        self.assertEqual(self.view.net_to_points[wire.net_id], {(0, 0), (100, 50)})
+
+    def test_split_uses_segment_index(self):
+        """Test that wire splitting finds the wire body without a scene query."""
+        wire = WireSegmentItem(0, 0, 200, 0)
+        self.view.scene().addItem(wire)
+        self.view.register_wire_connection(wire)
+
+        with patch.object(self.view._scene, "items", side_effect=AssertionError):
+            self.view._check_and_split_wire(QPointF(100, 0))
+
+        self.assertIsNone(wire.scene())
+        self.assertNotIn(wire, self.view.segment_index)
+        halves = self.view.endpoint_to_wires[(100, 0)]
+        self.assertEqual(len(halves), 2)
+        self.assertEqual(len(self.view.segment_index), 2)
+
+    def test_split_keeps_net_of_attached_wire(self):
+        """Test that splitting a wire keeps it and its neighbours on one net."""
+        wire_a = WireSegmentItem(0, 0, 100, 0)
+        wire_b = WireSegmentItem(100, 0, 100, 100)
+        for wire in (wire_a, wire_b):
+            self.view.scene().addItem(wire)
+            self.view.register_wire_connection(wire)
+
+        self.view._check_and_split_wire(QPointF(50, 0))
+
+        net_id = wire_b.net_id
+        self.assertEqual(set(self.view.point_to_net.values()), {net_id})
+        self.assertEqual(set(self.view.point_to_net),
+                         {(0, 0), (50, 0), (100, 0), (100, 100)})
+        self.assertEqual(list(self.view.net_to_wires), [net_id])
+        segments = self.view.net_to_wires[net_id]
+        self.assertNotIn(wire_a, segments)
+        self.assertEqual(len(segments), 3)
+        self.assertTrue(all(w.net_id == net_id for w in segments))
+
+    def test_create_wire_undo_redo_round_trip(self):
+        """Test that undoing a new wire clears its net data and redo restores it."""
+        self.view.wire_start_pos = QPointF(0, 0)
+        self.view._finalize_wire(QPointF(100, 0))
+        wire = self.view.endpoint_to_wires[(0, 0)][0]
+        net_id = wire.net_id
+        self.assertEqual(list(self.view.net_to_wires[net_id]), [wire])
+
+        self.view.undo_stack.undo()
+        self.assertIsNone(wire.scene())
+        self.assertEqual(self.view.point_to_net, {})
+        self.assertEqual(self.view.net_to_points, {})
+        self.assertNotIn(net_id, self.view.net_to_wires)
+        self.assertEqual(self.view.junctions, [])
+
+        self.view.undo_stack.redo()
+        self.assertIs(wire.scene(), self.view.scene())
+        self.assertEqual(list(self.view.net_to_wires[wire.net_id]), [wire])
+        self.assertEqual(len(self.view.junctions), 2)
+
+    def test_delete_wire_undo_round_trip(self):
+        """Test that deleting a wire clears its net data and undo re-registers it."""
+        self.view.wire_start_pos = QPointF(0, 0)
+        self.view._finalize_wire(QPointF(100, 0))
+        wire = self.view.endpoint_to_wires[(0, 0)][0]
+        net_id = wire.net_id
+
+        self.view.undo_stack.push(DeleteItemsCommand(self.view, [wire]))
+        self.assertIsNone(wire.scene())
+        self.assertEqual(self.view.point_to_net, {})
+        self.assertEqual(self.view.net_to_points, {})
+        self.assertNotIn(net_id, self.view.net_to_wires)
+        self.assertEqual(self.view.junctions, [])
+
+        self.view.undo_stack.undo()
+        self.assertIs(wire.scene(), self.view.scene())
+        self.assertEqual(list(self.view.net_to_wires[wire.net_id]), [wire])
+        self.assertEqual(self.view.point_to_net[(0, 0)], wire.net_id)
+        self.assertEqual(self.view.point_to_net[(100, 0)], wire.net_id)
+        self.assertEqual(len(self.view.junctions), 2)
+
+    def test_paste_wire_undo_clears_net_data(self):
+        """Test that undoing a paste drops the pasted wires from the net maps."""
+        wire = WireSegmentItem(0, 0, 100, 0)
+        self.view.undo_stack.push(PasteItemsCommand(self.view, [], [wire]))
+        net_id = wire.net_id
+        self.assertEqual(list(self.view.net_to_wires[net_id]), [wire])
+
+        self.view.undo_stack.undo()
+        self.assertIsNone(wire.scene())
+        self.assertEqual(self.view.point_to_net, {})
+        self.assertEqual(self.view.net_to_points, {})
+        self.assertNotIn(net_id, self.view.net_to_wires)
+        self.assertEqual(self.view.junctions, [])
+
+        self.view.undo_stack.redo()
+        self.assertEqual(list(self.view.net_to_wires[wire.net_id]), [wire])
+
     def test_cleanup_junctions(self):
         """Test that cleanup_junctions creates correct junctions."""
         wire1 = WireSegmentItem(0, 0, 100, 0)
@@ -452,6 +887,136 @@ class TestSchematicView(unittest.TestCase):
         self.assertIn((100, 0), junction_positions)
         self.assertIn((100, 100), junction_positions)
 
+    def test_endpoint_index_tracks_wires(self):
+        """Test that the endpoint index maps coordinates to attached wires."""
+        wire1 = WireSegmentItem(0, 0, 100, 0)
+        wire2 = WireSegmentItem(100, 0, 100, 100)
+
+        self.view.scene().addItem(wire1)
+        self.view.scene().addItem(wire2)
+        self.view.register_wire_connection(wire1)
+        self.view.register_wire_connection(wire2)
+
+        self.assertEqual(self.view.endpoint_to_wires[(100, 0)], [wire1, wire2])
+        self.assertEqual(self.view.endpoint_to_wires[(0, 0)], [wire1])
+
+        # Removing a wire drops it from every endpoint bucket
+        CreateWireCommand(self.view, wire2).undo()
+        self.assertEqual(self.view.endpoint_to_wires[(100, 0)], [wire1])
+        self.assertNotIn((100, 100), self.view.endpoint_to_wires)
+
+    def test_junctions_follow_wire_removal(self):
+        """Test that junctions are added and dropped incrementally with wires."""
+        wire1 = WireSegmentItem(0, 0, 100, 0)
+        wire2 = WireSegmentItem(100, 0, 100, 100)
+        self.view.undo_stack.push(CreateWireCommand(self.view, wire1))
+        self.view.undo_stack.push(CreateWireCommand(self.view, wire2))
+        self.assertEqual(len(self.view.junctions), 3)
+
+        shared = self.view.junction_at[(100, 0)]
+        self.view.undo_stack.undo()
+
+        # The shared junction survives, the dangling one is removed
+        self.assertIs(self.view.junction_at[(100, 0)], shared)
+        self.assertNotIn((100, 100), self.view.junction_at)
+        self.assertEqual(len(self.view.junctions), 2)
+
+    def test_junction_rebuild_does_not_stretch_wires(self):
+        """Test that bulk junction creation never triggers wire stretching."""
+        for x in range(0, 500, 100):
+            wire = WireSegmentItem(x, 0, x + 100, 0)
+            self.view.scene().addItem(wire)
+            self.view.register_wire_connection(wire)
+
+        with patch.object(self.view, "_stretch_wires_at") as mock_stretch:
+            self.view.cleanup_junctions()
+        mock_stretch.assert_not_called()
+        self.assertEqual(len(self.view.junctions), 6)
+
+    def test_cleanup_junctions_keeps_valid_junctions(self):
+        """Test that cleanup only adds/removes junctions that changed."""
+        wire = WireSegmentItem(0, 0, 100, 0)
+        self.view.scene().addItem(wire)
+        self.view.register_wire_connection(wire)
+        kept = self.view.junction_at[(0, 0)]
+
+        # Simulate a bulk index edit that moved one endpoint
+        self.view.endpoint_to_wires[(200, 0)] = self.view.endpoint_to_wires.pop((100, 0))
+        self.view.cleanup_junctions()
+
+        self.assertIs(self.view.junction_at[(0, 0)], kept)
+        self.assertEqual(set(self.view.junction_at), {(0, 0), (200, 0)})
+
+    def test_preview_snap_uses_latest_pending_position(self):
+        """Test that coalesced mouse moves only snap the most recent position."""
+        self.view.mode = "wire"
+        self.view._handle_wire_click(QPointF(0, 0))
+
+        self.view._snap_pending = QPointF(12, 3)
+        self.view._snap_pending = QPointF(47, 23)
+        self.view._apply_pending_snap()
+
+        line = self.view.preview_wire.line()
+        self.assertEqual((line.x2(), line.y2()), (50, 20))
+        self.assertIsNone(self.view._snap_pending)
+
+        self.view.cancel_wire_drawing()
+        self.assertFalse(self.view._snap_timer.isActive())
+
+    def test_preview_snap_skips_unchanged_head(self):
+        """Test that the preview is not reset when the snap target is unchanged."""
+        self.view.mode = "wire"
+        self.view._handle_wire_click(QPointF(0, 0))
+        self.view._snap_pending = QPointF(47, 23)
+        self.view._apply_pending_snap()
+
+        with patch.object(self.view.preview_wire, "setLine") as mock_set_line:
+            self.view._snap_pending = QPointF(49, 21)
+            self.view._apply_pending_snap()
+            mock_set_line.assert_not_called()
+
+            self.view._snap_pending = QPointF(61, 21)
+            self.view._apply_pending_snap()
+            mock_set_line.assert_called_once_with(0, 0, 60, 20)
+
+    def test_wire_drawing_uses_full_viewport_updates(self):
+        """Test that the viewport update mode is switched only while drawing."""
+        self.assertEqual(self.view.viewportUpdateMode(), QGraphicsView.BoundingRectViewportUpdate)
+        self.view.mode = "wire"
+        self.view._handle_wire_click(QPointF(0, 0))
+        self.assertEqual(self.view.viewportUpdateMode(), QGraphicsView.FullViewportUpdate)
+
+        self.view.cancel_wire_drawing()
+        self.assertEqual(self.view.viewportUpdateMode(), SchematicView.IDLE_VIEWPORT_UPDATE)
+
+    def test_opengl_viewport_is_opt_in(self):
+        """Test that the OpenGL viewport is only used when requested."""
+        self.assertNotIsInstance(self.view.viewport(), QOpenGLWidget)
+
+        gl_view = SchematicView(use_opengl=True)
+        self.assertIsInstance(gl_view.viewport(), QOpenGLWidget)
+        self.assertEqual(gl_view.viewport().format().samples(), SchematicView.OPENGL_SAMPLES)
+        self.assertEqual(gl_view.viewportUpdateMode(), QGraphicsView.FullViewportUpdate)
+        gl_view.cancel_wire_drawing()
+        self.assertEqual(gl_view.viewportUpdateMode(), QGraphicsView.FullViewportUpdate)
+
+    def test_pan_scrolls_by_mouse_delta(self):
+        """Test that a pan move scrolls by the mouse delta without snapping."""
+        self.view.resize(200, 200)
+        h_start = self.view.horizontalScrollBar().value()
+        v_start = self.view.verticalScrollBar().value()
+        self.view.panning = True
+        self.view.last_pan_point = QPoint(50, 50)
+
+        event = QMouseEvent(QEvent.MouseMove, QPointF(40, 30), QPointF(40, 30),
+                            Qt.NoButton, Qt.MiddleButton, Qt.NoModifier)
+        with patch.object(self.view, "_snap_point", side_effect=AssertionError):
+            self.view.mouseMoveEvent(event)
+
+        self.assertEqual(self.view.horizontalScrollBar().value(), h_start + 10)
+        self.assertEqual(self.view.verticalScrollBar().value(), v_start + 20)
+        self.assertEqual(self.view.last_pan_point, QPoint(40, 30))
+
     def test_clipboard_initially_empty(self):
         """Test that clipboard starts empty."""
         self.assertEqual(self.view.clipboard, {})
@@ -494,6 +1059,21 @@ class TestSchematicViewCopyPaste(unittest.TestCase):
         self.assertEqual(len(self.view.clipboard.get("wires", [])), 1)
         self.assertEqual(self.view.clipboard["wires"][0]["color"], "#00ff00")
 
+    def test_paste_component_gets_unique_ref(self):
+        """Test that a pasted component skips refs already in use."""
+        for ref in ("R1", "R2"):
+            model = Component(ref, comp_type="resistor")
+            self.view.components.append(model)
+            self.view.scene().addItem(ComponentItem(model))
+
+        self.view.clipboard = {
+            "components": [{"ref": "R1", "comp_type": "resistor", "x": 0, "y": 0}],
+            "wires": [],
+        }
+        self.view.paste_selection()
+
+        self.assertEqual([m.ref for m in self.view.components], ["R1", "R2", "R3"])
+
 
 class TestSchematicViewSaveLoad(unittest.TestCase):
     """Tests for save/load JSON functionality."""
@@ -569,6 +1149,104 @@ class TestSchematicViewSaveLoad(unittest.TestCase):
 
         self.assertEqual(loaded_data["wires"][0]["color"], "#00ff00")
 
+    def test_load_from_json_builds_nets_and_junctions(self):
+        """Test that a batch load registers wires and creates junctions once."""
+        temp_file = os.path.join(self.temp_dir, "test_load.json")
+        data = {
+            "version": "0.1",
+            "components": [],
+            "wires": [
+                {"x1": 0, "y1": 0, "x2": 100, "y2": 0, "net_id": 1, "color": "#ff0000"},
+                {"x1": 100, "y1": 0, "x2": 100, "y2": 100, "net_id": 1, "color": "#ff0000"},
+                {"x1": 300, "y1": 0, "x2": 400, "y2": 0, "net_id": 2, "color": "#00ff00"},
+            ]
+        }
+        with open(temp_file, 'w') as f:
+            json.dump(data, f)
+
+        with patch("ui.schematic_view.QFileDialog.getOpenFileName", return_value=(temp_file, "")):
+            self.view.load_from_json()
+
+        junction_positions = {(j.pos().x(), j.pos().y()) for j in self.view.junctions}
+        self.assertEqual(junction_positions, {(0, 0), (100, 0), (100, 100), (300, 0), (400, 0)})
+        self.assertEqual(len(self.view.net_to_wires), 2)
+        self.assertEqual(self.view.point_to_net[(0, 0)], self.view.point_to_net[(100, 100)])
+        self.assertNotEqual(self.view.point_to_net[(0, 0)], self.view.point_to_net[(300, 0)])
+
+    def test_load_from_json_unblocks_signals_on_bad_file(self):
+        """Test that a malformed file does not leave scene signals blocked."""
+        temp_file = os.path.join(self.temp_dir, "test_load_bad.json")
+        with open(temp_file, 'w') as f:
+            json.dump({"components": [{"comp_type": "resistor"}], "wires": []}, f)
+
+        with patch("ui.schematic_view.QFileDialog.getOpenFileName", return_value=(temp_file, "")):
+            with self.assertRaises(KeyError):
+                self.view.load_from_json()
+
+        self.assertFalse(self.view.scene().signalsBlocked())
+
+    def test_load_from_json_labels_nets_without_merging(self):
+        """Test that wires joined by a later wire get one net without merges."""
+        temp_file = os.path.join(self.temp_dir, "test_load_bridge.json")
+        data = {
+            "version": "0.1",
+            "components": [],
+            "wires": [
+                {"x1": 0, "y1": 0, "x2": 100, "y2": 0, "net_id": 1},
+                {"x1": 200, "y1": 0, "x2": 300, "y2": 0, "net_id": 2},
+                {"x1": 100, "y1": 0, "x2": 200, "y2": 0, "net_id": 1},
+            ]
+        }
+        with open(temp_file, 'w') as f:
+            json.dump(data, f)
+
+        with patch("ui.schematic_view.QFileDialog.getOpenFileName", return_value=(temp_file, "")):
+            self.view.load_from_json()
+
+        self.assertEqual(len(self.view.net_to_wires), 1)
+        net_id = self.view.point_to_net[(0, 0)]
+        self.assertEqual(self.view.net_to_points[net_id], {(0, 0), (100, 0), (200, 0), (300, 0)})
+
+    def test_save_to_json_writes_live_items_only(self):
+        """Test that saving uses the view's item lists and skips removed items."""
+        kept = ComponentItem(Component("R1", comp_type="resistor"))
+        removed = ComponentItem(Component("R2", comp_type="resistor"))
+        for item in (kept, removed):
+            self.view.scene().addItem(item)
+        self.view.scene().removeItem(removed)
+
+        wire = WireSegmentItem(0, 0, 100, 0)
+        self.view.scene().addItem(wire)
+        self.view.register_wire_connection(wire)
+        preview = WireSegmentItem(0, 0, 50, 50, preview=True)
+        self.view.scene().addItem(preview)
+
+        temp_file = os.path.join(self.temp_dir, "test_save_items.json")
+        with patch("ui.schematic_view.QFileDialog.getSaveFileName", return_value=(temp_file, "")):
+            self.view.save_to_json()
+
+        with open(temp_file, 'r') as f:
+            saved = json.load(f)
+        self.assertEqual([c["ref"] for c in saved["components"]], ["R1"])
+        self.assertEqual([(w["x1"], w["x2"]) for w in saved["wires"]], [(0, 100)])
+
+    def test_save_to_json_compact_above_limit(self):
+        """Test that large schematics are saved without indentation."""
+        for x in (0, 100):
+            wire = WireSegmentItem(x, 0, x + 50, 0)
+            self.view.scene().addItem(wire)
+            self.view.register_wire_connection(wire)
+
+        temp_file = os.path.join(self.temp_dir, "test_save_compact.json")
+        with patch("ui.schematic_view.QFileDialog.getSaveFileName", return_value=(temp_file, "")):
+            with patch.object(SchematicView, "PRETTY_SAVE_LIMIT", 1):
+                self.view.save_to_json()
+
+        with open(temp_file, 'r') as f:
+            text = f.read()
+        self.assertNotIn("\n", text)
+        self.assertEqual(len(json.loads(text)["wires"]), 2)
+
 
 class TestComponentModel(unittest.TestCase):
     """Tests for Component model."""
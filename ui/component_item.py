@@ -17,6 +17,7 @@ class ComponentItem(QGraphicsRectItem):
         self.ref:  str = self.model.ref
         self.old_pos: Optional[QPointF] = None
         self._is_being_moved_by_master = False  # Flag to prevent recursive snapping
+        self._cached_view = None  # Owning view, resolved lazily from the scene
 
         # --- Flags ---
         self.setFlags(
@@ -73,6 +74,13 @@ class ComponentItem(QGraphicsRectItem):
             -label_rect.height() - 5
         )
 
+    def _view(self):
+        """Returns the scene's first view, cached to avoid rebuilding views() per move."""
+        if self._cached_view is None and self.scene():
+            views = self.scene().views()
+            self._cached_view = views[0] if views else None
+        return self._cached_view
+
     def _snap_to_grid(self, pos: QPointF) -> QPointF:
         """Calculates the nearest grid intersection for a given position."""
         x = round(pos.x() / self.GRID_SIZE) * self.GRID_SIZE
@@ -84,6 +92,11 @@ class ComponentItem(QGraphicsRectItem):
         Check if this component is the 'master' (first ComponentItem in selection).
         Only the master should handle moving junctions to avoid duplicate movements.
         """
+        # The view caches the master on selectionChanged; scan only without one
+        view = self._view()
+        if hasattr(view, "_selection_master"):
+            return view._selection_master is self
+
         if not self.scene():
             return False
 
@@ -111,6 +124,24 @@ class ComponentItem(QGraphicsRectItem):
                 self._move_selected_junctions_proportionally(delta)
 
             return new_pos
+        elif change == QGraphicsItem.ItemSceneChange:
+            # Leaving this scene: drop out of its view's item list and snap index
+            view = self._view()
+            if hasattr(view, "_component_left_scene"):
+                view._component_left_scene(self)
+            self._cached_view = None
+        elif change == QGraphicsItem.ItemSceneHasChanged:
+            view = self._view()
+            if hasattr(view, "_component_entered_scene"):
+                view._component_entered_scene(self)
+        elif change in (QGraphicsItem.ItemPositionHasChanged,
+                        QGraphicsItem.ItemRotationHasChanged,
+                        QGraphicsItem.ItemTransformHasChanged):
+            # Keep the view's snap index in step with the pins' scene positions
+            view = self._view()
+            if hasattr(view, "_index_snap_target"):
+                for p_item in self.pin_items:
+                    view._index_snap_target(p_item)
         return super().itemChange(change, value)
 
     def _move_selected_junctions_proportionally(self, component_delta: QPointF) -> None:
@@ -119,20 +150,23 @@ class ComponentItem(QGraphicsRectItem):
         by the same absolute delta to maintain relative spacing.
         Component moves 1 increment (50px) -> Junction moves 5 increments (5*10px = 50px)
         """
-        from ui.junction_item import JunctionItem
-
-        if not self.scene():
+        # The view keeps the selected junctions partitioned out; scan only without one
+        view = self._view()
+        if hasattr(view, "_selected_junctions"):
+            junctions = view._selected_junctions
+        elif self.scene():
+            from ui.junction_item import JunctionItem
+            junctions = [item for item in self.scene().selectedItems()
+                         if isinstance(item, JunctionItem)]
+        else:
             return
 
-        selected_items = self.scene().selectedItems()
-
-        for item in selected_items:
-            if isinstance(item, JunctionItem):
-                # Set flag to prevent junction's own snapping logic from interfering
-                item._is_being_moved_by_master = True
-                # Move junction by the same absolute delta (preserving relative spacing)
-                item.setPos(item.pos() + component_delta)
-                item._is_being_moved_by_master = False
+        for item in junctions:
+            # Set flag to prevent junction's own snapping logic from interfering
+            item._is_being_moved_by_master = True
+            # Move junction by the same absolute delta (preserving relative spacing)
+            item.setPos(item.pos() + component_delta)
+            item._is_being_moved_by_master = False
 
     def mousePressEvent(self, event) -> None:
         # FIX: Use pos() instead of scenePos() to be consistent with itemChange snapping
@@ -2,13 +2,48 @@
 from typing import Optional
 from PySide6.QtWidgets import QGraphicsItem, QWidget
 from PySide6.QtGui import QPen, QColor, QPainter
-from PySide6.QtCore import QRectF, Qt
+from PySide6.QtCore import QRectF, QLineF, Qt
+
+
+GRID_PEN = QPen(QColor(100, 100, 100), 0)  # Sharp cosmetic line
+
+# Level of detail: on-screen line spacing (px) below which the grid thins out
+GRID_COARSE_PIXELS = 6  # Draw every 5th line
+GRID_MIN_PIXELS = 3     # Even the coarse grid is noise: draw nothing
+
+
+def draw_grid(painter: QPainter, visible_rect: QRectF, spacing: int) -> None:
+    """Draws the grid lines (one every 5 * spacing) that fall inside visible_rect."""
+    step = 5 * spacing
+
+    # Thin the grid out when zoomed far out (the view only scales, never rotates)
+    pixels = step * abs(painter.worldTransform().m11())
+    if pixels < GRID_COARSE_PIXELS:
+        step *= 5
+        if pixels * 5 < GRID_MIN_PIXELS:
+            return
+
+    painter.setPen(GRID_PEN)
+    painter.setRenderHint(QPainter.Antialiasing, False)
+
+    # Align to the line step so partial repaints line up with the rest
+    left = int(visible_rect.left()) - (int(visible_rect.left()) % step)
+    top = int(visible_rect.top()) - (int(visible_rect.top()) % step)
+    right = int(visible_rect.right())
+    bottom = int(visible_rect.bottom())
+
+    # Vertical then horizontal lines, submitted in a single drawLines call
+    lines = [QLineF(x, top, x, bottom) for x in range(left, right + step, step)]
+    lines.extend(QLineF(left, y, right, y) for y in range(top, bottom + step, step))
+    painter.drawLines(lines)
 
 
 class GridItem(QGraphicsItem):
     """
     A background item that draws a coordinate grid.
     Static and non-selectable to serve as a visual guide for component snapping.
+    SchematicView paints the same grid in drawBackground instead of using
+    this item, so wire edits never dirty a scene-sized item.
     """
 
     def __init__(self, spacing: int = 50):
@@ -29,23 +64,5 @@ class GridItem(QGraphicsItem):
 
     def paint(self, painter: QPainter, option, widget: Optional[QWidget] = None) -> None:
         """Draws the vertical and horizontal grid lines within the visible area."""
-        # Setup a sharp, non-antialiased cosmetic pen
-        pen = QPen(QColor(100, 100, 100), 0)
-        painter.setPen(pen)
-        painter.setRenderHint(QPainter.Antialiasing, False)
-
         # Optimization: Only draw the portion of the grid currently visible in the viewport
-        visible_rect = option.exposedRect
-
-        left = int(visible_rect.left()) - (int(visible_rect.left()) % self.spacing)
-        top = int(visible_rect.top()) - (int(visible_rect.top()) % self.spacing)
-        right = int(visible_rect.right())
-        bottom = int(visible_rect.bottom())
-
-        # Draw vertical lines
-        for x in range(left, right + 5 * self.spacing, 5 * self.spacing):
-            painter.drawLine(x, top, x, bottom)
-
-        # Draw horizontal lines
-        for y in range(top, bottom + 5 * self.spacing, 5 * self.spacing):
-            painter.drawLine(left, y, right, y)
\ No newline at end of file
+        draw_grid(painter, option.exposedRect, self.spacing)
\ No newline at end of file
@@ -1,27 +1,35 @@
 # ui/schematic_view.py
 import json
-from typing import List, Dict, Tuple, Optional, Any
+from typing import List, Dict, Set, Tuple, Optional, Any
 from PySide6.QtWidgets import QGraphicsView, QGraphicsScene, QFileDialog
-from PySide6.QtCore import Qt, QPointF, QRectF
+from PySide6.QtCore import Qt, QPointF, QRectF, QTimer
 from PySide6.QtGui import QPainter, QColor, QWheelEvent
 
 from core.component import Component
 from ui.component_item import ComponentItem
 from ui.junction_item import JunctionItem
-from ui.pin_item import PinItem
 from ui.wire_segment_item import WireSegmentItem
 from ui.undo_commands import UndoStack, CreateWireCommand, DeleteItemsCommand, PasteItemsCommand, WireColorChangeCommand
-from ui.grid import GridItem
+from ui.grid import draw_grid
+from ui.spatial_hash import SpatialHash, SegmentHash
 
 
 class SchematicView(QGraphicsView):
     GRID_SIZE = 10
+    PREVIEW_INTERVAL_MS = 16  # At most one preview snap per frame (~60 Hz)
+    WIRE_HIT_TOLERANCE = 5  # Half of WireSegmentItem's 10px hit stroke
+    IDLE_VIEWPORT_UPDATE = QGraphicsView.BoundingRectViewportUpdate
+    OPENGL_SAMPLES = 4  # MSAA samples for the optional OpenGL viewport
+    PRETTY_SAVE_LIMIT = 1000  # Items above which saves are written compact
 
-    def __init__(self):
+    def __init__(self, use_opengl: bool = False):
         super().__init__()
 
         # --- Scene & View Configuration ---
-        self._scene = QGraphicsScene()
+        self._scene = QGraphicsScene(self)
+        # Wires and junctions are added, split and moved constantly; keeping a
+        # BSP tree balanced costs more than it saves for this workload
+        self._scene.setItemIndexMethod(QGraphicsScene.NoIndex)
         self.setScene(self._scene)
         self.setSceneRect(-5000, -5000, 10000, 10000)
 
@@ -33,9 +41,33 @@ class SchematicView(QGraphicsView):
         # Ensures zoom centers on the mouse cursor
         self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
 
-        # --- Initialize Background Grid ---
-        self.grid_item = GridItem(self.GRID_SIZE)
-        self._scene.addItem(self.grid_item)
+        self._idle_update_mode = self.IDLE_VIEWPORT_UPDATE
+        if use_opengl:
+            # Imported here so the editor still loads on systems without OpenGL
+            from PySide6.QtGui import QSurfaceFormat
+            from PySide6.QtOpenGLWidgets import QOpenGLWidget
+
+            # GPU viewport: partial updates buy nothing, it redraws whole frames.
+            # The GL paint engine antialiases through multisampling
+            gl_widget = QOpenGLWidget()
+            gl_format = QSurfaceFormat()
+            gl_format.setSamples(self.OPENGL_SAMPLES)
+            gl_widget.setFormat(gl_format)
+            self.setViewport(gl_widget)
+            self._idle_update_mode = QGraphicsView.FullViewportUpdate
+
+        # Repaint one rect around everything dirty this frame: drags that
+        # stretch many wires skip per-item region math, and the cached grid
+        # makes the extra area a cheap blit. The grid lives in drawBackground,
+        # so a moving wire never invalidates a scene-sized grid item.
+        # Wire drawing switches to full updates (see _handle_wire_click)
+        self.setViewportUpdateMode(self._idle_update_mode)
+        # The grid is static: render drawBackground once into a viewport-sized
+        # pixmap and blit it; Qt re-renders only on zoom/resize and for newly
+        # exposed strips when scrolling
+        self.setCacheMode(QGraphicsView.CacheBackground)
+        # Items set their own pen/brush in paint(); drawBackground restores its own state
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState, True)
 
         # --- Navigation State ---
         self.zoom_step = 1.2
@@ -48,19 +80,109 @@ class SchematicView(QGraphicsView):
         self.mode = "component"
 
         self.next_net_id = 1
-        self.point_to_net: Dict[Tuple[float, float], int] = {}
-        self.net_to_wires: Dict[int, List[WireSegmentItem]] = {}
-        self.junctions: List[JunctionItem] = []
+        self.point_to_net: Dict[Tuple[int, int], int] = {}
+        # Reverse of point_to_net, so merges rewrite each point once
+        self.net_to_points: Dict[int, Set[Tuple[int, int]]] = {}
+        # Values are insertion-ordered sets (dict keys) for O(1) membership
+        self.net_to_wires: Dict[int, Dict[WireSegmentItem, None]] = {}
+        self.endpoint_to_wires: Dict[Tuple[int, int], List[WireSegmentItem]] = {}
+        self.junction_at: Dict[Tuple[int, int], JunctionItem] = {}
+        self._bulk_loading = False  # Defers junction creation during batch loads
+
+        # Pins and junctions by position; items keep themselves up to date
+        self.snap_index = SpatialHash(cell_size=50)
+        # Live items by type (ordered sets), so save never walks the scene
+        self.component_items: Dict[ComponentItem, None] = {}
+        self.wire_items: Dict[WireSegmentItem, None] = {}
+        # Registered wire bodies, for split hit-tests
+        self.segment_index = SegmentHash(cell_size=50)
+
+        # Junctions and components consult these on every drag step; refreshed
+        # once per selection change. The master is the first selected component
+        self._selection_has_component = False
+        self._selection_master: Optional[ComponentItem] = None
+        self._selected_junctions: List[JunctionItem] = []
+        self._scene.selectionChanged.connect(self._on_selection_changed)
 
         self.drawing_wire = False
         self.wire_start_pos: Optional[QPointF] = None
         self.preview_wire: Optional[WireSegmentItem] = None
 
+        # Mouse moves are coalesced: only the latest position is snapped per frame
+        self._snap_pending: Optional[QPointF] = None
+        self._snap_timer = QTimer(self)
+        self._snap_timer.setSingleShot(True)
+        self._snap_timer.setInterval(self.PREVIEW_INTERVAL_MS)
+        self._snap_timer.timeout.connect(self._apply_pending_snap)
+
         # --- Wire Color ---
         self._current_wire_color = QColor(255, 0, 0)  # Default red
 
         self.clipboard: Dict[str, Any] = {}
 
+    @staticmethod
+    def point_key(x: float, y: float) -> Tuple[int, int]:
+        """
+        Hashable key for a scene coordinate, used by all endpoint/net maps.
+        Rounds to whole scene units: cheaper to hash than floats and immune
+        to drift. Pins sit on half-grid offsets (e.g. y+25), so keys are not
+        snapped to GRID_SIZE.
+        """
+        return int(round(x)), int(round(y))
+
+    def _wire_keys(self, wire: WireSegmentItem) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """Returns the point keys of both wire endpoints."""
+        line = wire.line()
+        return self.point_key(line.x1(), line.y1()), self.point_key(line.x2(), line.y2())
+
+    @property
+    def junctions(self) -> List[JunctionItem]:
+        """All junction dots currently shown, one per used wire endpoint."""
+        return list(self.junction_at.values())
+
+    def _index_snap_target(self, item) -> None:
+        """Records (or moves) a pin/junction in the snap index."""
+        pt = item.scene_connection_point()
+        self.snap_index.insert(item, pt.x(), pt.y())
+
+    def _unindex_snap_target(self, item) -> None:
+        self.snap_index.remove(item)
+
+    def _component_entered_scene(self, item: ComponentItem) -> None:
+        """Called by ComponentItem once it is in the scene."""
+        self.component_items[item] = None
+        for p_item in item.pin_items:
+            self._index_snap_target(p_item)
+
+    def _component_left_scene(self, item: ComponentItem) -> None:
+        """Called by ComponentItem just before it leaves the scene."""
+        self.component_items.pop(item, None)
+        for p_item in item.pin_items:
+            self._unindex_snap_target(p_item)
+
+    def _on_selection_changed(self) -> None:
+        """Partitions the selection once (see ComponentItem/JunctionItem.itemChange)."""
+        master = None
+        junctions = []
+        for item in self._scene.selectedItems():
+            if isinstance(item, JunctionItem):
+                junctions.append(item)
+            elif master is None and isinstance(item, ComponentItem):
+                master = item
+        self._selection_master = master
+        self._selection_has_component = master is not None
+        self._selected_junctions = junctions
+
+    def drawBackground(self, painter: QPainter, rect: QRectF) -> None:
+        """Fills the background colour, then draws the grid over the exposed area."""
+        super().drawBackground(painter, rect)
+        visible_rect = rect.intersected(self.sceneRect())
+        if visible_rect.isEmpty():
+            return
+        painter.save()
+        draw_grid(painter, visible_rect, self.GRID_SIZE)
+        painter.restore()
+
     def wheelEvent(self, event: QWheelEvent) -> None:
         """Handles zooming via the mouse scroll wheel."""
         if event.angleDelta().y() > 0:
@@ -76,24 +198,20 @@ class SchematicView(QGraphicsView):
         Calculates the snapping target.
         Prioritizes pins, then falls back to the 25px wire grid.
         """
-        # 1. Check for nearby pins (Proximity Snap)
-        snap_radius = 10
-        search_area = QRectF(pt.x() - snap_radius, pt.y() - snap_radius,
-                             snap_radius * 2, snap_radius * 2)
+        x, y = pt.x(), pt.y()
 
-        for item in self._scene.items(search_area):
-            if hasattr(item, "scene_connection_point"):
-                return item.scene_connection_point()
+        # 1. Check for nearby pins/junctions (Proximity Snap)
+        snap_radius = 10
+        hit = self.snap_index.nearest(x, y, snap_radius)
+        if hit:
+            return QPointF(hit[1], hit[2])
 
-        # 2. Fallback to updated 25px Wire Grid Snap
-        x = round(pt.x() / self.GRID_SIZE) * self.GRID_SIZE
-        y = round(pt.y() / self.GRID_SIZE) * self.GRID_SIZE
-        return QPointF(x, y)
+        # 2. Fallback to the wire grid (floor-division rounding, half-up)
+        g = self.GRID_SIZE
+        half = g / 2
+        return QPointF(int((x + half) // g) * g, int((y + half) // g) * g)
 
     def mousePressEvent(self, event):
-        scene_pos = self.mapToScene(event.pos())
-        snapped_pos = self._snap_point(scene_pos)
-
         if event.button() == Qt.MiddleButton or (
                 event.button() == Qt.LeftButton and event.modifiers() == Qt.AltModifier):
             self.panning = True
@@ -102,7 +220,8 @@ class SchematicView(QGraphicsView):
             return
 
         if self.mode == "wire" and event.button() == Qt.LeftButton:
-            self._handle_wire_click(snapped_pos)
+            # Only wire clicks need a snap target; pans and selection clicks skip it
+            self._handle_wire_click(self._snap_point(self.mapToScene(event.pos())))
             return
 
         super().mousePressEvent(event)
@@ -115,6 +234,9 @@ class SchematicView(QGraphicsView):
 
             self.drawing_wire = True
             self.wire_start_pos = pos
+            # The preview's dirty rect spans anchor to cursor and changes every
+            # frame; repainting the viewport skips per-item region bookkeeping
+            self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
             # Create preview wire with current color
             self.preview_wire = WireSegmentItem(
                 pos.x(), pos.y(), pos.x(), pos.y(),
@@ -139,7 +261,7 @@ class SchematicView(QGraphicsView):
             end_pos.x(), end_pos.y(),
             color=self._current_wire_color
         )
-        self.register_wire_connection(new_wire)
+        # The command's redo() adds and registers the wire
         self.undo_stack.push(CreateWireCommand(self, new_wire))
 
         self.wire_start_pos = end_pos
@@ -151,49 +273,64 @@ class SchematicView(QGraphicsView):
 
     def _check_and_split_wire(self, pos: QPointF):
         """Detects if a point intersects a wire body and splits it to allow a junction."""
-        for item in self.scene().items(pos):
-            if isinstance(item, WireSegmentItem) and not item.preview:
-                line = item.line()
-                p1, p2 = line.p1(), line.p2()
+        px, py = pos.x(), pos.y()
+        point_key = self.point_key
+        pos_key = point_key(px, py)
+        for item in self.segment_index.candidates(px, py, self.WIRE_HIT_TOLERANCE):
+            # Read the geometry once per candidate
+            line = item.line()
+            x1, y1, x2, y2 = line.x1(), line.y1(), line.x2(), line.y2()
+            if self._segment_hit(x1, y1, x2, y2, px, py):
+                old_p1, old_p2 = point_key(x1, y1), point_key(x2, y2)
 
                 # If the point is already an endpoint, no split needed
-                if pos == p1 or pos == p2:
+                if pos_key == old_p1 or pos_key == old_p2:
                     continue
 
-                # Remove old wire endpoints
-                old_p1 = (p1.x(), p1.y())
-                old_p2 = (p2.x(), p2.y())
-                if old_p1 in self.point_to_net:  del self.point_to_net[old_p1]
-                if old_p2 in self.point_to_net: del self.point_to_net[old_p2]
-
                 # Preserve the original wire's color
                 original_color = item.color
 
                 # Split the wire into two segments meeting at 'pos'
-                self._scene.removeItem(item)
+                scene = self._scene
+                scene.removeItem(item)
 
-                # Remove from net tracking before splitting
-                # (Simple approach:  cleanup_junctions will fix the visuals)
-                w1 = WireSegmentItem(p1.x(), p1.y(), pos.x(), pos.y(), color=original_color)
-                w2 = WireSegmentItem(pos.x(), pos.y(), p2.x(), p2.y(), color=original_color)
+                w1 = WireSegmentItem(x1, y1, px, py, color=original_color)
+                w2 = WireSegmentItem(px, py, x2, y2, color=original_color)
 
-                self._scene.addItem(w1)
-                self._scene.addItem(w2)
+                scene.addItem(w1)
+                scene.addItem(w2)
 
                 self.register_wire_connection(w1)
                 self.register_wire_connection(w2)
+
+                # The halves inherit the original's net through its endpoints;
+                # unregister it last so the shared end junctions are kept
+                self.unregister_wire_connection(item)
                 break
 
+    def _segment_hit(self, x1: float, y1: float, x2: float, y2: float,
+                     x: float, y: float) -> bool:
+        """True if (x, y) lies within WIRE_HIT_TOLERANCE of the segment."""
+        dx, dy = x2 - x1, y2 - y1
+        length_sq = dx * dx + dy * dy
+        px, py = x - x1, y - y1
+        # Project onto the segment, clamped to its ends
+        t = 0.0 if length_sq == 0 else max(0.0, min(1.0, (px * dx + py * dy) / length_sq))
+        ex, ey = px - t * dx, py - t * dy
+        return ex * ex + ey * ey <= self.WIRE_HIT_TOLERANCE ** 2
+
     def register_wire_connection(self, wire: WireSegmentItem):
         """Registers endpoints and ensures junction items exist at both ends."""
-        p1 = (wire.line().x1(), wire.line().y1())
-        p2 = (wire.line().x2(), wire.line().y2())
+        p1, p2 = self._wire_keys(wire)
 
         # Logic for Net assignment
         net1 = self.point_to_net.get(p1)
         net2 = self.point_to_net.get(p2)
 
         if net1 and net2 and net1 != net2:
+            # Union by size: relabel the smaller net so repeated merges stay cheap
+            if len(self.net_to_wires.get(net2, ())) > len(self.net_to_wires.get(net1, ())):
+                net1, net2 = net2, net1
             self._merge_nets(net1, net2)
             target_net = net1
         else:
@@ -204,50 +341,181 @@ class SchematicView(QGraphicsView):
         wire.net_id = target_net
 
         # Register the points in the mapping
-        self.point_to_net[p1] = target_net
-        self.point_to_net[p2] = target_net
+        self._assign_point_net(p1, target_net)
+        self._assign_point_net(p2, target_net)
 
         # Update net tracking
-        if target_net not in self.net_to_wires:
-            self.net_to_wires[target_net] = []
-        if wire not in self.net_to_wires[target_net]:
-            self.net_to_wires[target_net].append(wire)
+        self.net_to_wires.setdefault(target_net, {})[wire] = None
+
+        # Index the endpoints; this also adds junction dots at new coordinates
+        self._index_wire_endpoints(wire)
+
+    def _assign_point_net(self, pt: Tuple[int, int], net_id: int) -> None:
+        """Maps a point to a net, keeping net_to_points in sync."""
+        old_net = self.point_to_net.get(pt)
+        if old_net is not None and old_net != net_id:
+            self.net_to_points.get(old_net, set()).discard(pt)
+        self.point_to_net[pt] = net_id
+        self.net_to_points.setdefault(net_id, set()).add(pt)
+
+    def _forget_point(self, pt: Tuple[int, int]) -> None:
+        """Drops a point from both net maps."""
+        net_id = self.point_to_net.pop(pt, None)
+        if net_id is not None:
+            points = self.net_to_points.get(net_id)
+            if points is not None:
+                points.discard(pt)
+                if not points:
+                    del self.net_to_points[net_id]
+
+    def unregister_wire_connection(self, wire: WireSegmentItem) -> None:
+        """
+        Reverses register_wire_connection for a wire leaving the schematic.
+        Endpoints no longer used by any wire are dropped from the net maps.
+        Nets are not split: a net bridged only by this wire keeps one ID.
+        """
+        self._unindex_wire_endpoints(wire)
+        wires = self.net_to_wires.get(wire.net_id)
+        if wires is not None:
+            wires.pop(wire, None)
+            if not wires:
+                del self.net_to_wires[wire.net_id]
+        for pt in self._wire_keys(wire):
+            if pt not in self.endpoint_to_wires:
+                self._forget_point(pt)
+
+    def _register_wires_bulk(self, wires: List[WireSegmentItem]) -> None:
+        """
+        Registers many wires at once (used by load_from_json).
+        Connected endpoints are grouped with a local union-find first, so each
+        wire is labelled exactly once instead of being relabelled by merges.
+        """
+        parent: Dict[Tuple[int, int], Tuple[int, int]] = {}
+
+        def find(pt):
+            parent.setdefault(pt, pt)
+            while parent[pt] != pt:
+                parent[pt] = parent[parent[pt]]
+                pt = parent[pt]
+            return pt
+
+        keys = [self._wire_keys(w) for w in wires]
+        for p1, p2 in keys:
+            r1, r2 = find(p1), find(p2)
+            if r1 != r2:
+                parent[r2] = r1
+
+        net_for_root: Dict[Tuple[int, int], int] = {}
+        for wire, (p1, p2) in zip(wires, keys):
+            root = find(p1)
+            net_id = net_for_root.get(root)
+            if net_id is None:
+                net_id = net_for_root[root] = self.next_net_id
+                self.next_net_id += 1
+            wire.net_id = net_id
+            self._assign_point_net(p1, net_id)
+            self._assign_point_net(p2, net_id)
+            self.net_to_wires.setdefault(net_id, {})[wire] = None
+            self._index_wire_endpoints(wire)
 
-        # Refresh visual junction dots
-        self.cleanup_junctions()
+    def _index_wire_endpoints(self, wire: WireSegmentItem) -> None:
+        """
+        Records the wire under both endpoint coordinates for O(1) lookups.
+        The bucket size doubles as the endpoint reference count: the first
+        wire at a coordinate creates its junction dot.
+        """
+        line = wire.line()
+        x1, y1, x2, y2 = line.x1(), line.y1(), line.x2(), line.y2()
+        self.wire_items[wire] = None
+        self.segment_index.insert(wire, x1, y1, x2, y2)
+        for pt in (self.point_key(x1, y1), self.point_key(x2, y2)):
+            wires = self.endpoint_to_wires.setdefault(pt, [])
+            if wire not in wires:
+                wires.append(wire)
+            if not self._bulk_loading and pt not in self.junction_at:
+                j = JunctionItem(pt[0], pt[1])
+                self.junction_at[pt] = j
+                self._scene.addItem(j)
+
+    def _unindex_wire_endpoints(self, wire: WireSegmentItem) -> None:
+        """
+        Drops the wire from the endpoint index (removal or split).
+        The junction dot goes away with the last wire at a coordinate.
+        """
+        self.wire_items.pop(wire, None)
+        self.segment_index.remove(wire)
+        for pt in self._wire_keys(wire):
+            wires = self.endpoint_to_wires.get(pt)
+            if wires and wire in wires:
+                wires.remove(wire)
+                if not wires:
+                    del self.endpoint_to_wires[pt]
+                    self._remove_junction_at(pt)
+
+    def _remove_junction_at(self, pt: Tuple[int, int]) -> None:
+        """Removes the junction dot registered at a coordinate, if any."""
+        j = self.junction_at.pop(pt, None)
+        if j is not None and j.scene():
+            self._scene.removeItem(j)
+
+    def _move_endpoint(self, old_pt: Tuple[int, int], new_pt: Tuple[int, int]) -> None:
+        """
+        Re-keys the endpoint index and junction map after a stretch.
+        Endpoints that land on an occupied coordinate merge into it.
+        """
+        if old_pt == new_pt:
+            return
+
+        wires = self.endpoint_to_wires.pop(old_pt, None)
+        if wires:
+            target = self.endpoint_to_wires.setdefault(new_pt, [])
+            for w in wires:
+                if w not in target:
+                    target.append(w)
+
+        j = self.junction_at.pop(old_pt, None)
+        if j is not None:
+            # The moving junction replaces any dot already sitting at new_pt
+            if self.junction_at.get(new_pt) is not j:
+                self._remove_junction_at(new_pt)
+            self.junction_at[new_pt] = j
 
     def _stretch_wires_at(self, old_pos: QPointF, new_pos: QPointF):
         """
         Updates wires visually during a drag.
         Fix: Updates permanent wire geometry and anchors the preview wire.
         """
-        old_pt = (old_pos.x(), old_pos.y())
-        new_pt = (new_pos.x(), new_pos.y())
-
-        for item in self._scene.items():
-            if isinstance(item, WireSegmentItem) and not item.preview:
-                line = item.line()
-                p1 = line.p1()
-                p2 = line.p2()
-                changed = False
-
-                # 1. Update permanent wire geometry (Erase old / Draw new)
-                if p1 == old_pos:
-                    p1 = new_pos
-                    changed = True
-                if p2 == old_pos:
-                    p2 = new_pos
-                    changed = True
-
-                if changed:
-                    # This call triggers the visual update/erase of the old line
-                    item.setLine(p1.x(), p1.y(), p2.x(), p2.y())
-
-                    # Update logical net mapping
-                    if old_pt in self.point_to_net:
-                        net_id = self.point_to_net.get(old_pt)
-                        # We use setdefault or simple assignment to ensure the new point is mapped
-                        self.point_to_net[new_pt] = net_id
+        old_pt = self.point_key(old_pos.x(), old_pos.y())
+        new_pt = self.point_key(new_pos.x(), new_pos.y())
+
+        # Only wires indexed at old_pt can be affected (the preview is never indexed)
+        wires = self.endpoint_to_wires.get(old_pt, ())
+        point_key = self.point_key
+        segment_insert = self.segment_index.insert
+        nx, ny = new_pos.x(), new_pos.y()
+        for item in wires:
+            line = item.line()
+            x1, y1, x2, y2 = line.x1(), line.y1(), line.x2(), line.y2()
+
+            # 1. Update permanent wire geometry (Erase old / Draw new)
+            if point_key(x1, y1) == old_pt:
+                x1, y1 = nx, ny
+            if point_key(x2, y2) == old_pt:
+                x2, y2 = nx, ny
+
+            # This call triggers the visual update/erase of the old line
+            item.setLine(x1, y1, x2, y2)
+            segment_insert(item, x1, y1, x2, y2)
+
+        # Update logical net mapping once for the shared endpoint
+        if wires and old_pt in self.point_to_net:
+            self._assign_point_net(new_pt, self.point_to_net[old_pt])
+
+        # Carry the endpoint index and junction map over to the new coordinate
+        self._move_endpoint(old_pt, new_pt)
+        # Nothing is left at the old coordinate: drop it from the net maps
+        if old_pt != new_pt and old_pt not in self.endpoint_to_wires:
+            self._forget_point(old_pt)
 
         # 2. Update the preview wire anchor (The wire being currently drawn)
         if self.drawing_wire and self.preview_wire:
@@ -265,52 +533,68 @@ class SchematicView(QGraphicsView):
 
     def cleanup_junctions(self):
         """
-        Ensures exactly one JunctionItem exists at every wire endpoint coordinate.
+        Reconciles junctions with the endpoint index in one pass.
+        Wire edits keep junctions up to date incrementally; this pass is only
+        needed after bulk changes to the index. Junctions that are still valid
+        are kept, so only the difference is added to or removed from the scene.
         """
-        # 1. Clear existing junctions from the scene
-        for j in self.junctions:
-            if j.scene():
-                self._scene.removeItem(j)
-        self.junctions.clear()
-
-        # 2. Identify all unique endpoints currently in use by wires
-        active_points = set()
-        for item in self._scene.items():
-            if isinstance(item, WireSegmentItem) and not item.preview:
-                line = item.line()
-                active_points.add((line.x1(), line.y1()))
-                active_points.add((line.x2(), line.y2()))
-
-        # 3. Create one junction dot per unique coordinate
-        # This naturally handles "sharing" because a set only stores unique values
-        for pt in active_points:
-            j = JunctionItem(pt[0], pt[1])
-            self.junctions.append(j)
-            self._scene.addItem(j)
+        # 1. Drop junctions whose coordinate no longer has any wire
+        stale = [pt for pt in self.junction_at if pt not in self.endpoint_to_wires]
+        for pt in stale:
+            self._remove_junction_at(pt)
+
+        # 2. Create one junction dot per indexed endpoint that lacks one
+        junction_at = self.junction_at
+        add_item = self._scene.addItem
+        for pt in self.endpoint_to_wires:
+            if pt not in junction_at:
+                j = JunctionItem(pt[0], pt[1])
+                junction_at[pt] = j
+                add_item(j)
 
     def _merge_nets(self, net_keep: int, net_remove: int):
         """Unifies two nets into one when they are connected by a new wire."""
-        wires_to_move = self.net_to_wires.pop(net_remove, [])
+        wires_to_move = self.net_to_wires.pop(net_remove, {})
+        keep_wires = self.net_to_wires.setdefault(net_keep, {})
         for w in wires_to_move:
             w.net_id = net_keep
-            self.net_to_wires[net_keep].append(w)
-            # Update all endpoint mappings for moved wires
-            self.point_to_net[(w.line().x1(), w.line().y1())] = net_keep
-            self.point_to_net[(w.line().x2(), w.line().y2())] = net_keep
+            keep_wires[w] = None
+
+        # Endpoints shared by several wires are rewritten once, not per wire
+        points_to_move = self.net_to_points.pop(net_remove, set())
+        self.net_to_points.setdefault(net_keep, set()).update(points_to_move)
+        for pt in points_to_move:
+            self.point_to_net[pt] = net_keep
 
     def mouseMoveEvent(self, event):
-        scene_pos = self.mapToScene(event.pos())
+        # event.pos() builds a new QPoint per call; read it once per event
+        pos = event.pos()
         if self.panning and self.last_pan_point:
-            delta = event.pos() - self.last_pan_point
-            self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() - delta.x())
-            self.verticalScrollBar().setValue(self.verticalScrollBar().value() - delta.y())
-            self.last_pan_point = event.pos()
+            delta = pos - self.last_pan_point
+            h_bar = self.horizontalScrollBar()
+            v_bar = self.verticalScrollBar()
+            h_bar.setValue(h_bar.value() - delta.x())
+            v_bar.setValue(v_bar.value() - delta.y())
+            self.last_pan_point = pos
             return
         if self.mode == "wire" and self.drawing_wire and self.preview_wire:
-            snapped = self._snap_point(scene_pos)
-            self.preview_wire.setLine(self.wire_start_pos.x(), self.wire_start_pos.y(), snapped.x(), snapped.y())
+            self._snap_pending = self.mapToScene(pos)
+            if not self._snap_timer.isActive():
+                self._snap_timer.start()
         super().mouseMoveEvent(event)
 
+    def _apply_pending_snap(self) -> None:
+        """Snaps the latest coalesced mouse position and moves the preview wire head."""
+        pos = self._snap_pending
+        self._snap_pending = None
+        if pos is None or not (self.drawing_wire and self.preview_wire):
+            return
+        snapped = self._snap_point(pos)
+        # Moves within the same snap target leave the preview untouched (no repaint)
+        if self.preview_wire.line().p2() == snapped:
+            return
+        self.preview_wire.setLine(self.wire_start_pos.x(), self.wire_start_pos.y(), snapped.x(), snapped.y())
+
     def mouseReleaseEvent(self, event):
         if self.panning:
             self.panning = False
@@ -325,7 +609,7 @@ class SchematicView(QGraphicsView):
         """
         if event.key() == Qt.Key_Escape:
             if self.drawing_wire:
-                self._cancel_wire_drawing()
+                self.cancel_wire_drawing()
             else:
                 # If not currently drawing, allow standard behavior (like deselecting)
                 super().keyPressEvent(event)
@@ -341,7 +625,7 @@ class SchematicView(QGraphicsView):
             # Propagate other keys (like R for rotation) to the items or window
             super().keyPressEvent(event)
 
-    def _cancel_wire_drawing(self) -> None:
+    def cancel_wire_drawing(self) -> None:
         """
         Exits the wire creation state and removes temporary UI elements.
         """
@@ -354,6 +638,9 @@ class SchematicView(QGraphicsView):
         # Reset state variables
         self.drawing_wire = False
         self.wire_start_pos = None
+        self._snap_pending = None
+        self._snap_timer.stop()
+        self.setViewportUpdateMode(self._idle_update_mode)
 
         # Optional: update the viewport to ensure the preview is cleared immediately
         self.viewport().update()
@@ -392,12 +679,9 @@ class SchematicView(QGraphicsView):
         Returns:
             int: The grid size (10px or 50px).
         """
-        selected_items = self.scene().selectedItems()
-
-        # Check if at least one component is selected
-        for item in selected_items:
-            if isinstance(item, ComponentItem):
-                return 50  # Snap to 50px grid
+        # Snap to 50px grid if at least one component is selected
+        if self._selection_has_component:
+            return 50
 
         # If no components are selected, snap to 10px grid
         return 10
@@ -408,26 +692,52 @@ class SchematicView(QGraphicsView):
         with open(path, 'r') as f:
             data = json.load(f)
         self._scene.clear()
+        self.snap_index.clear()
+        self.segment_index.clear()
+        self.component_items.clear()
+        self.wire_items.clear()
         self.components.clear()
         self.point_to_net.clear()
+        self.net_to_points.clear()
         self.net_to_wires.clear()
-        self._scene.addItem(GridItem(self.GRID_SIZE))
-        for c_data in data.get("components", []):
-            model = Component(c_data["ref"], comp_type=c_data["comp_type"], parameters=c_data.get("parameters"))
-            self.components.append(model)
-            item = ComponentItem(model)
-            item.setPos(c_data["x"], c_data["y"])
-            item.setRotation(c_data.get("rotation", 0))
-            self._scene.addItem(item)
-        for w_data in data.get("wires", []):
-            color = QColor(w_data.get("color", "#ff0000")) if w_data.get("color") else None
-            wire = WireSegmentItem(
-                w_data["x1"], w_data["y1"], w_data["x2"], w_data["y2"],
-                net_id=w_data["net_id"],
-                color=color
-            )
-            self._scene.addItem(wire)
-            self.register_wire_connection(wire)
+        self.endpoint_to_wires.clear()
+        self.junction_at.clear()
+
+        # Keep selection/change notifications quiet while the scene is populated;
+        # a malformed file must not leave them blocked for the rest of the session
+        self._scene.blockSignals(True)
+        try:
+            for c_data in data.get("components", []):
+                model = Component(c_data["ref"], comp_type=c_data["comp_type"], parameters=c_data.get("parameters"))
+                self.components.append(model)
+                item = ComponentItem(model)
+                item.setPos(c_data["x"], c_data["y"])
+                item.setRotation(c_data.get("rotation", 0))
+                self._scene.addItem(item)
+
+            # Pass 1: insert every wire; nets and junctions are derived afterwards
+            wires: List[WireSegmentItem] = []
+            for w_data in data.get("wires", []):
+                color = QColor(w_data.get("color", "#ff0000")) if w_data.get("color") else None
+                wire = WireSegmentItem(
+                    w_data["x1"], w_data["y1"], w_data["x2"], w_data["y2"],
+                    net_id=w_data["net_id"],
+                    color=color
+                )
+                self._scene.addItem(wire)
+                wires.append(wire)
+
+            # Pass 2: label nets in one sweep, then create all junctions at once
+            self._bulk_loading = True
+            try:
+                self._register_wires_bulk(wires)
+            finally:
+                self._bulk_loading = False
+            self.cleanup_junctions()
+        finally:
+            self._scene.blockSignals(False)
+
+        self._scene.update()
 
     def save_to_json(self):
         """Saves the current schematic to a JSON file."""
@@ -437,30 +747,28 @@ class SchematicView(QGraphicsView):
 
         # Collect component data
         components_data = []
-        for item in self._scene.items():
-            if isinstance(item, ComponentItem):
-                components_data.append({
-                    "ref": item.model.ref,
-                    "comp_type": item.model.type,
-                    "x": item.pos().x(),
-                    "y": item.pos().y(),
-                    "rotation": item.rotation(),
-                    "parameters": item.model.parameters
-                })
+        for item in self.component_items:
+            components_data.append({
+                "ref": item.model.ref,
+                "comp_type": item.model.type,
+                "x": item.pos().x(),
+                "y": item.pos().y(),
+                "rotation": item.rotation(),
+                "parameters": item.model.parameters
+            })
 
         # Collect wire data
         wires_data = []
-        for item in self._scene.items():
-            if isinstance(item, WireSegmentItem) and not item.preview:
-                line = item.line()
-                wires_data.append({
-                    "x1": line.x1(),
-                    "y1": line.y1(),
-                    "x2": line.x2(),
-                    "y2": line.y2(),
-                    "net_id": item.net_id,
-                    "color": item.color_hex  # Save as hex string
-                })
+        for item in self.wire_items:
+            line = item.line()
+            wires_data.append({
+                "x1": line.x1(),
+                "y1": line.y1(),
+                "x2": line.x2(),
+                "y2": line.y2(),
+                "net_id": item.net_id,
+                "color": item.color_hex  # Save as hex string
+            })
 
         # Build the final data structure
         data = {
@@ -469,9 +777,11 @@ class SchematicView(QGraphicsView):
             "wires": wires_data
         }
 
-        # Write to file
+        # Write to file. Indented output forces the pure-Python encoder, so
+        # large schematics are written compact through the C encoder
+        indent = 2 if len(components_data) + len(wires_data) <= self.PRETTY_SAVE_LIMIT else None
         with open(path, 'w') as f:
-            json.dump(data, f, indent=2)
+            f.write(json.dumps(data, indent=indent))
 
     def copy_selection(self):
         """Copies the currently selected components and wires to the clipboard."""
@@ -523,8 +833,8 @@ class SchematicView(QGraphicsView):
         new_component_items = []
         new_wire_items = []
 
-        # Generate unique reference counters
-        existing_refs = {item.model.ref for item in self._scene.items() if isinstance(item, ComponentItem)}
+        # Generate unique reference counters (from the model list, no scene walk)
+        existing_refs = {model.ref for model in self.components}
 
         # Paste components
         for c_data in self.clipboard.get("components", []):
@@ -576,12 +886,10 @@ class SchematicView(QGraphicsView):
         # Collect all endpoints of pasted wires
         pasted_endpoints = set()
         for wire in pasted_wires:
-            line = wire.line()
-            pasted_endpoints.add((line.x1(), line.y1()))
-            pasted_endpoints.add((line.x2(), line.y2()))
+            pasted_endpoints.update(self._wire_keys(wire))
 
         # Select junctions at those endpoints
-        for junction in self.junctions:
-            junction_pos = (junction.pos().x(), junction.pos().y())
-            if junction_pos in pasted_endpoints:
+        for pt in pasted_endpoints:
+            junction = self.junction_at.get(pt)
+            if junction is not None:
                 junction.setSelected(True)
@@ -0,0 +1,131 @@
+# ui/spatial_hash.py
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class SpatialHash:
+    """
+    Buckets point-like items by (x // cell, y // cell) for fast proximity queries.
+    Used by SchematicView to find snap targets (pins, junctions) without
+    walking the scene.
+    """
+
+    def __init__(self, cell_size: int = 50):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Dict[Any, Tuple[float, float]]] = {}
+        self._item_cell: Dict[Any, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._item_cell)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._item_cell
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, item: Any, x: float, y: float) -> None:
+        """Adds the item at (x, y), or moves it there if already present."""
+        cell = self._cell(x, y)
+        old_cell = self._item_cell.get(item)
+        if old_cell is not None and old_cell != cell:
+            self._discard_from_cell(item, old_cell)
+        self._cells.setdefault(cell, {})[item] = (x, y)
+        self._item_cell[item] = cell
+
+    def remove(self, item: Any) -> None:
+        """Removes the item; unknown items are ignored."""
+        cell = self._item_cell.pop(item, None)
+        if cell is not None:
+            self._discard_from_cell(item, cell)
+
+    def _discard_from_cell(self, item: Any, cell: Tuple[int, int]) -> None:
+        bucket = self._cells.get(cell)
+        if bucket is None:
+            return
+        bucket.pop(item, None)
+        if not bucket:
+            del self._cells[cell]
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._item_cell.clear()
+
+    def nearest(self, x: float, y: float, radius: float) -> Optional[Tuple[Any, float, float]]:
+        """
+        Returns (item, x, y) for the item closest to (x, y) within a square
+        box of half-width radius, or None when nothing is in range.
+        """
+        min_cx, min_cy = self._cell(x - radius, y - radius)
+        max_cx, max_cy = self._cell(x + radius, y + radius)
+
+        best = None
+        best_dist = None
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = self._cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for item, (ix, iy) in bucket.items():
+                    dx, dy = ix - x, iy - y
+                    if abs(dx) > radius or abs(dy) > radius:
+                        continue
+                    dist = dx * dx + dy * dy
+                    if best_dist is None or dist < best_dist:
+                        best, best_dist = (item, ix, iy), dist
+        return best
+
+
+class SegmentHash:
+    """
+    Buckets line segments into every cell their bounding box touches, so
+    point hit-tests only look at segments near the point.
+    """
+
+    def __init__(self, cell_size: int = 50):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Dict[Any, None]] = {}
+        self._item_cells: Dict[Any, List[Tuple[int, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._item_cells)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._item_cells
+
+    def _cell_range(self, min_x: float, min_y: float,
+                    max_x: float, max_y: float) -> List[Tuple[int, int]]:
+        c = self.cell_size
+        return [(cx, cy)
+                for cx in range(int(min_x // c), int(max_x // c) + 1)
+                for cy in range(int(min_y // c), int(max_y // c) + 1)]
+
+    def insert(self, item: Any, x1: float, y1: float, x2: float, y2: float) -> None:
+        """Adds the segment, or re-buckets it if already present."""
+        self.remove(item)
+        cells = self._cell_range(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        for cell in cells:
+            self._cells.setdefault(cell, {})[item] = None
+        self._item_cells[item] = cells
+
+    def remove(self, item: Any) -> None:
+        """Removes the segment; unknown items are ignored."""
+        for cell in self._item_cells.pop(item, ()):
+            bucket = self._cells.get(cell)
+            if bucket is None:
+                continue
+            bucket.pop(item, None)
+            if not bucket:
+                del self._cells[cell]
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._item_cells.clear()
+
+    def candidates(self, x: float, y: float, radius: float) -> List[Any]:
+        """Segments whose cells overlap the square box of half-width radius around (x, y)."""
+        found: Dict[Any, None] = {}
+        for cell in self._cell_range(x - radius, y - radius, x + radius, y + radius):
+            bucket = self._cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return list(found)
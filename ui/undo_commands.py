@@ -12,17 +12,27 @@ if TYPE_CHECKING:
 class UndoStack:
     """Manages a history of commands for undo/redo functionality."""
 
-    def __init__(self):
+    # Commands keep their items alive (e.g. deleted or pasted wires), so the
+    # history is capped; the oldest commands are dropped first
+    MAX_UNDO = 100
+
+    def __init__(self, max_undo: Optional[int] = None):
         self.stack: List[Any] = []
         self.index: int = -1  # Points to the last executed command
+        self.max_undo = self.MAX_UNDO if max_undo is None else max_undo
 
     def push(self, command: Any) -> None:
         """Adds a new command to the stack and executes its redo action."""
-        self.stack = self.stack[:self.index + 1]
+        del self.stack[self.index + 1:]
         self.stack.append(command)
         command.redo()
         self.index += 1
 
+        overflow = len(self.stack) - self.max_undo
+        if overflow > 0:
+            del self.stack[:overflow]
+            self.index -= overflow
+
     def undo(self) -> None:
         if self.index >= 0:
             self.stack[self.index].undo()
@@ -75,8 +85,8 @@ class CreateWireCommand:
         # FIX: Only remove if the item is actually in the scene
         if self.wire.scene() == self.view._scene:
             self.view._scene.removeItem(self.wire)
-        # Net cleanup is handled dynamically by SchematicView
-        self.view.cleanup_junctions()
+        # Drops the wire from every index; unused junctions go with it
+        self.view.unregister_wire_connection(self.wire)
 
     def redo(self):
         # FIX: Only add if the item is not already in the scene
@@ -111,64 +121,46 @@ class DeleteItemsCommand:
 
     def __init__(self, view: 'SchematicView', items: List[QGraphicsItem]):
         from ui.junction_item import JunctionItem
-        from ui.wire_segment_item import WireSegmentItem
 
         self.view = view
-        self.items = items
+        # Junctions are derived from wire endpoints and managed by the view
+        self.items = [item for item in items if not isinstance(item, JunctionItem)]
         self.models = [item.model for item in items if hasattr(item, 'model')]
-        self.junction_items = [item for item in items if isinstance(item, JunctionItem)]
-        self.wire_snapshot = []
-
-        for item in self.items:
-            if isinstance(item, WireSegmentItem):
-                line = item.line()
-                self.wire_snapshot.append(((line.x1(), line.y1()), (line.x2(), line.y2()), item.net_id))
 
     def redo(self):
+        from ui.wire_segment_item import WireSegmentItem
+
         # Remove items from the scene safely
         for item in self.items:
             # Check if the item is still in the scene before removing
             if item.scene() == self.view._scene:
                 self.view._scene.removeItem(item)
-
-            # Handle junctions explicitly
-            if item in self.view.junctions:
-                self.view.junctions.remove(item)
+            # Drops the wire from every index and net map; unused junctions go with it
+            if isinstance(item, WireSegmentItem):
+                self.view.unregister_wire_connection(item)
 
         # Remove models from components safely
         for model in self.models:
             if model in self.view.components:
                 self.view.components.remove(model)
 
-        # Clean up junctions after deletions
-        self.view.cleanup_junctions()
-
     def undo(self):
+        from ui.wire_segment_item import WireSegmentItem
+
         # Restore items to the scene safely
         for item in self.items:
             # Prevent adding duplicates to the scene
             if not item.scene():
                 self.view._scene.addItem(item)
-
-            # Restore junctions explicitly
-            if item in self.junction_items and item not in self.view.junctions:
-                self.view.junctions.append(item)
+            # Re-registering rejoins whatever nets now meet the wire's endpoints
+            if isinstance(item, WireSegmentItem):
+                self.view.register_wire_connection(item)
 
         # Restore models to components safely
         for model in self.models:
             if model not in self.view.components:
                 self.view.components.append(model)
 
-        # Restore wires to point_to_net mapping
-        for (p1, p2, net_id) in self.wire_snapshot:
-            if p1 not in self.view.point_to_net:
-                self.view.point_to_net[p1] = net_id
-            if p2 not in self.view.point_to_net:
-                self.view.point_to_net[p2] = net_id
-
-        # Clean up junctions after restoration
-        self.view.cleanup_junctions()
-
 
 # ui/undo_commands.py
 from PySide6.QtGui import QUndoCommand, QColor
@@ -264,8 +256,6 @@ class PasteItemsCommand:
                 self.view.register_wire_connection(wire)
             wire.setSelected(True)
 
-        self.view.cleanup_junctions()
-
         # Select junctions belonging to pasted wires
         self._select_pasted_junctions()
 
@@ -274,6 +264,7 @@ class PasteItemsCommand:
         for wire in self.wire_items:
             if wire.scene() == self.view._scene:
                 self.view._scene.removeItem(wire)
+            self.view.unregister_wire_connection(wire)
 
         # Remove components from scene
         for item in self.component_items:
@@ -285,21 +276,17 @@ class PasteItemsCommand:
             if model in self.view.components:
                 self.view.components.remove(model)
 
-        self.view.cleanup_junctions()
-
     def _select_pasted_junctions(self):
         """Selects all junctions that belong to the pasted wires."""
         # Collect all endpoints of pasted wires
         pasted_endpoints = set()
         for wire in self.wire_items:
-            line = wire.line()
-            pasted_endpoints.add((line.x1(), line.y1()))
-            pasted_endpoints.add((line.x2(), line.y2()))
+            pasted_endpoints.update(self.view._wire_keys(wire))
 
         # Select junctions at those endpoints
-        for junction in self.view.junctions:
-            junction_pos = (junction.pos().x(), junction.pos().y())
-            if junction_pos in pasted_endpoints:
+        for pt in pasted_endpoints:
+            junction = self.view.junction_at.get(pt)
+            if junction is not None:
                 junction.setSelected(True)
 
 
@@ -1,5 +1,5 @@
 # ui/wire_segment_item.py
-from typing import Optional, Any
+from typing import Optional, Any, Dict, Tuple
 from PySide6.QtWidgets import QGraphicsLineItem, QGraphicsItem, QWidget
 from PySide6.QtGui import QPen, QColor, QPainterPath, QPainterPathStroker, QPainter
 from PySide6.QtCore import Qt, QPointF
@@ -13,6 +13,10 @@ class WireSegmentItem(QGraphicsLineItem):
     GRID_SIZE = 10  # Changed from 50
 
     DEFAULT_COLOR = QColor(255, 0, 0)  # Red
+    PREVIEW_Z = 1000  # Above pins and junctions (Z 5)
+
+    # One pen per (role, RGBA), shared by every wire of that colour
+    _pen_cache: Dict[Tuple[str, int], QPen] = {}
 
     def __init__(self, x1: float, y1: float, x2: float, y2: float,
                  net_id: Optional[int] = None, preview:  bool = False,
@@ -25,8 +29,9 @@ class WireSegmentItem(QGraphicsLineItem):
         self.start_node = None  # Reference to PinItem or JunctionItem
         self.end_node = None
 
-        # Wire color (stored as QColor)
+        # Wire color (stored as QColor, with its hex name cached for save/copy)
         self._color = QColor(color) if color else QColor(self.DEFAULT_COLOR)
+        self._color_hex = self._color.name()
 
         if not self.preview:
             # Wires are selectable but NOT movable on their own
@@ -36,23 +41,54 @@ class WireSegmentItem(QGraphicsLineItem):
             )
             self.setAcceptHoverEvents(True)
             self.setAcceptedMouseButtons(Qt. LeftButton)
+        else:
+            # The preview follows the cursor: keep it on top of everything,
+            # uncached (it changes every frame) and out of mouse hit-testing
+            self.setZValue(self.PREVIEW_Z)
+            self.setCacheMode(QGraphicsItem.NoCache)
+            self.setAcceptedMouseButtons(Qt.NoButton)
 
         # Standard wire styling
         self._update_pen()
 
+    @classmethod
+    def _pen_for(cls, role: str, color: QColor) -> QPen:
+        """Returns the shared pen for a role ("base", "preview", "select", "glow") and color."""
+        key = (role, color.rgba())
+        pen = cls._pen_cache.get(key)
+        if pen is None:
+            pen = cls._build_pen(role, color)
+            cls._pen_cache[key] = pen
+        return pen
+
+    @staticmethod
+    def _build_pen(role: str, color: QColor) -> QPen:
+        if role == "select":
+            # Selection uses a brighter/thicker version of the wire's own color
+            select_color = QColor(color)
+            h, s, l, a = select_color.getHsl()
+            select_color.setHsl(h, s, min(l + 40, 255), a)
+            pen = QPen(select_color, 3)
+        elif role == "glow":
+            # Glow uses the wire's own color with transparency
+            glow_color = QColor(color)
+            glow_color.setAlpha(140)
+            pen = QPen(glow_color, 6)
+        else:
+            pen = QPen(color, 2)
+            pen.setCapStyle(Qt.RoundCap)
+            if role == "preview":
+                pen.setStyle(Qt.DashLine)
+                # Make preview slightly transparent but use wire's color
+                preview_color = QColor(color)
+                preview_color.setAlpha(180)
+                pen.setColor(preview_color)
+        pen.setCosmetic(True)
+        return pen
+
     def _update_pen(self) -> None:
         """Updates the pen based on current color setting."""
-        self.base_pen = QPen(self._color, 2)
-        self.base_pen.setCosmetic(True)
-        self.base_pen.setCapStyle(Qt.RoundCap)
-
-        if self.preview:
-            self.base_pen.setStyle(Qt.DashLine)
-            # Make preview slightly transparent but use wire's color
-            preview_color = QColor(self._color)
-            preview_color.setAlpha(180)
-            self.base_pen.setColor(preview_color)
-
+        self.base_pen = self._pen_for("preview" if self.preview else "base", self._color)
         self.setPen(self.base_pen)
 
     @property
@@ -63,19 +99,18 @@ class WireSegmentItem(QGraphicsLineItem):
     @property
     def color_hex(self) -> str:
         """Returns the current color as a hex string for serialization."""
-        return self._color.name()
+        return self._color_hex
 
     def set_color(self, color: QColor) -> None:
         """Sets the wire color."""
         self._color = QColor(color)
+        self._color_hex = self._color.name()
         self._update_pen()
         self.update()
 
     def set_color_from_hex(self, hex_color: str) -> None:
         """Sets the wire color from a hex string."""
-        self._color = QColor(hex_color)
-        self._update_pen()
-        self.update()
+        self.set_color(QColor(hex_color))
 
     def shape(self) -> QPainterPath:
         """Increases the hit-box of the wire for easier selection."""
@@ -90,24 +125,24 @@ class WireSegmentItem(QGraphicsLineItem):
     def paint(self, painter: QPainter, option, widget: Optional[QWidget] = None) -> None:
         """Draws the wire with dynamic state (selection/glow)."""
         if self.isSelected():
-            # Selection uses a brighter/thicker version of the wire's own color
-            select_color = QColor(self._color)
-            # Brighten the color for selection visibility
-            h, s, l, a = select_color.getHsl()
-            select_color.setHsl(h, s, min(l + 40, 255), a)
-            pen = QPen(select_color, 3)
-            pen.setCosmetic(True)
+            pen = self._pen_for("select", self._color)
         elif self.is_highlighted:
-            # Glow uses the wire's own color with transparency
-            glow_color = QColor(self._color)
-            glow_color.setAlpha(140)
-            pen = QPen(glow_color, 6)
-            pen.setCosmetic(True)
+            pen = self._pen_for("glow", self._color)
         else:
-            pen = self.pen()
+            pen = self.base_pen
 
+        line = self.line()
         painter.setPen(pen)
-        painter.drawLine(self.line())
+        # Horizontal/vertical segments gain nothing from antialiasing; drawing
+        # them aliased takes the raster engine's fast path. Diagonals keep it
+        if line.x1() == line.x2() or line.y1() == line.y2():
+            antialiased = painter.testRenderHint(QPainter.Antialiasing)
+            painter.setRenderHint(QPainter.Antialiasing, False)
+            painter.drawLine(line)
+            # The view sets DontSavePainterState, so restore for the next item
+            painter.setRenderHint(QPainter.Antialiasing, antialiased)
+        else:
+            painter.drawLine(line)
 
     def set_glow(self, enabled: bool) -> None:
         """Triggers a visual highlight of the segment."""